@@ -1,8 +1,12 @@
-from datetime import datetime
-from math import floor
-from typing import List, Dict
+from collections import defaultdict
+from datetime import date
+from itertools import count
+from typing import Dict, Iterable, Iterator, List
 from exceptions import ScheduleException
 
+REQUIRED_KEYS = frozenset(("name", "room"))
+NECESSARY_KEYS = frozenset(("code", "class", "lecturer"))
+
 
 class CalendarHelper:
     """
@@ -11,6 +15,8 @@ class CalendarHelper:
     Static Methods:
         format(subjects_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
             Format the input list of subjects data.
+        iter_format(subjects_data: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+            Format subjects data one subject at a time.
     """
 
     @staticmethod
@@ -25,42 +31,43 @@ class CalendarHelper:
             List[Dict[str, str]]: The formatted list of subjects data with added fields such as
             'repeat', 'start_period_date', 'end_period_date', and 'color'.
         """
-        required_keys = ["name", "room"]
-        necessary_keys = ["code", "class", "lecturer"]
+        return list(CalendarHelper.iter_format(subjects_data))
+
+    @staticmethod
+    def iter_format(subjects_data: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Format subjects data lazily, yielding each subject once it is formatted.
 
-        subject_colors: Dict[str, str] = {}
+        Args:
+            subjects_data (Iterable[Dict[str, str]]): The subjects data to format.
+
+        Yields:
+            Dict[str, str]: The subject with the fields added by `format`.
+        """
+        # Every new subject name gets the next color id, starting from "1"
+        color_ids = count(1)
+        subject_colors: Dict[str, str] = defaultdict(lambda: str(next(color_ids)))
 
         for subject in subjects_data:
-            for key in required_keys:
-                if key not in subject.keys():
-                    raise ScheduleException(f"Missing '{key}' field.")
+            missing_keys = REQUIRED_KEYS - subject.keys()
+            if missing_keys:
+                raise ScheduleException(f"Missing '{min(missing_keys)}' field.")
 
-            for key in necessary_keys:
-                if key not in subject.keys():
-                    print(f"Warning: Missing '{key}' field of '{subject['name']}'. This field will be blank.")
-                    subject[key] = ""
+            for key in sorted(NECESSARY_KEYS - subject.keys()):
+                print(f"Warning: Missing '{key}' field of '{subject['name']}'. This field will be blank.")
+                subject[key] = ""
 
-            from_date = datetime.fromisoformat(subject["from_date"])
-            to_date = datetime.fromisoformat(subject["to_date"])
+            # Both dates are ISO strings: "YYYY-MM-DD" followed by "THH:MM:SS"
+            from_day = date.fromisoformat(subject["from_date"][:10]).toordinal()
+            to_day = date.fromisoformat(subject["to_date"][:10]).toordinal()
 
             # Calculate the number of weeks between from_date and to_date and convert to string
-            subject["repeat"] = str(floor((to_date - from_date).days / 7))
+            subject["repeat"] = str((to_day - from_day) // 7)
             subject["start_period_date"] = subject["from_date"]
 
-            # Create a datetime object with the same date as from_date and the time from to_date
-            subject["end_period_date"] = datetime(
-                from_date.year,
-                from_date.month,
-                from_date.day,
-                to_date.hour,
-                to_date.minute,
-                to_date.second,
-            ).isoformat()
-
-            # Assign a color to the subject if it doesn't have one already
-            if not subject_colors.get(subject["name"]):
-                subject_colors[subject["name"]] = str(len(subject_colors) + 1)
+            # The date of from_date joined with the time of to_date
+            subject["end_period_date"] = subject["from_date"][:10] + subject["to_date"][10:]
 
             subject["color"] = subject_colors[subject["name"]]
 
-        return subjects_data
+            yield subject
@@ -1,15 +1,49 @@
-import json
 import os
-from typing import Dict, List, Literal, Union, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Literal, Tuple, Union
 
+import httplib2
+import json_utils
 from config import TIME_ZONE
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google.auth.exceptions import RefreshError
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+BATCH_LIMIT = 50  # Maximum number of calls in a single batch request
+# Reasons Google gives for exceeded quotas; other 403s are real permission errors
+RATE_LIMIT_REASONS = frozenset(("rateLimitExceeded", "userRateLimitExceeded"))
+MAX_INSERT_WORKERS = 8
+INSERT_RETRIES = 5
+
+
+def _is_rate_limited(exception: Exception) -> bool:
+    """
+    Check if a request failed because a Calendar API quota was exceeded.
+
+    Args:
+        exception (Exception): The exception raised by the request.
+
+    Returns:
+        bool: True if the request can be retried later, False otherwise.
+    """
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status == 429:
+        return True
+    if exception.resp.status != 403:
+        return False
+    # the reasons are listed under "errors", or "details" in newer responses
+    try:
+        error = json_utils.loads(exception.content)["error"]
+        details = error.get("errors", []) + error.get("details", [])
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return False
+    return any(detail.get("reason") in RATE_LIMIT_REASONS for detail in details)
 
 
 class CalendarResponse:
@@ -37,8 +71,8 @@ class CalendarResponse:
             file_name (str, optional): The name of the JSON file to save the data to.
                 Defaults to "response.json".
         """
-        with open(file_name, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False)
+        with open(file_name, "wb") as f:
+            f.write(json_utils.dumps(self.data))
         print(f"File '{file_name}' is saved.")
 
 
@@ -58,7 +92,7 @@ class Calendar:
         get(get_type: Literal["calendars", "events"], name: str = "") -> CalendarResponse: Retrieve calendar data (calendars or events).
         get_calendar_id(name: str) -> Union[str, ValueError]: Get the calendar ID for a given calendar name.
         is_exist(name: str) -> bool: Check if a calendar with a given name exists.
-        create_event(events: List[Dict[str, str]], name: str) -> None: Create events in a calendar.
+        create_event(events: Iterable[Dict[str, str]], name: str) -> None: Create events in a calendar.
         create_calendar(name: str) -> None: Create a new calendar.
         update_calendar(name: str, new_name: str): Update the name of an existing calendar.
         delete_calendar(name: str): Delete a calendar.
@@ -73,6 +107,8 @@ class Calendar:
         self.token_path: str = f"{self.path}/{token_path}"
         self.creds = None
         self.service = None
+        # Calendar name -> calendar id, built lazily by _load_calendar_index
+        self._name_to_id: Union[Dict[str, str], None] = None
 
         self.get_credentials()
 
@@ -80,12 +116,23 @@ class Calendar:
         # Because the Resource object generates methods dynamically.
         # So in this case, static type checking will not work as expected.
         # Using the 'Any' type to compress any errors related to the Resource object.
-        self.service: Any = build("calendar", "v3", credentials=self.creds)
+        # The discovery document bundled with the client library is already used by
+        # default; the file cache for fetched documents is only disabled to silence
+        # its warning.
+        self.service: Any = build(
+            "calendar",
+            "v3",
+            credentials=self.creds,
+            cache_discovery=False,
+        )
 
     def get_credentials(self):
         # https://developers.google.com/calendar/api/quickstart/python
         if os.path.exists(self.token_path):
-            self.creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
+            with open(self.token_path, "rb") as token:
+                self.creds = Credentials.from_authorized_user_info(
+                    json_utils.loads(token.read()), SCOPES
+                )
         # If there are no (valid) credentials available, let the user log in.
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
@@ -96,7 +143,10 @@ class Calendar:
                         os.remove(self.token_path)
                     except FileNotFoundError:
                         pass
-                    self.get_credentials()
+                    # Drop the revoked credentials so the retry goes through the login flow.
+                    # The retry saves the new token itself.
+                    self.creds = None
+                    return self.get_credentials()
             else:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.credentials_path, SCOPES
@@ -106,42 +156,49 @@ class Calendar:
             with open(self.token_path, "w") as token:
                 token.write(self.creds.to_json())
 
-    def get(self, get_type: Literal["calendars", "events"], name: str = ""):
+    def get(
+        self,
+        get_type: Literal["calendars", "events"],
+        name: str = "",
+        fields: Union[str, None] = None,
+    ):
         """
         Retrieve calendar data (calendars or events).
 
         Args:
             get_type (Literal["calendars", "events"]): The type of data to retrieve.
             name (str, optional): The name of the calendar (for events). Defaults to "".
+            fields (str, optional): The item fields to request, e.g. "id,summary".
+                Defaults to None, which returns the full resources.
 
         Returns:
             CalendarResponse: An object containing the retrieved data.
         """
         supported_types = ["calendars", "events"]
         page_token = None
-        fetch_data: Dict = {}
         result = []
+        # partial response: only ask for what the caller needs
+        if fields:
+            fields = f"items({fields}),nextPageToken"
 
         if get_type not in supported_types:
             raise ValueError(f"'get_type' must be one of {supported_types}")
 
         if get_type == "calendars":
-            fetch_data = (
-                self.service.calendarList().list(pageToken=page_token).execute()
-            )
-        if get_type == "events":
-            if name:
-                fetch_data = (
-                    self.service.events()
-                    .list(calendarId=self.get_calendar_id(name), pageToken=page_token)
-                    .execute()
-                )
-            else:
+            list_page = self.service.calendarList().list
+        else:
+            if not name:
                 raise ValueError("You must provide specific calendar name.")
+            calendar_id = self.get_calendar_id(name)
+
+            def list_page(pageToken=None, fields=None):
+                return self.service.events().list(
+                    calendarId=calendar_id, pageToken=pageToken, fields=fields
+                )
 
         while True:
-            for entry in fetch_data["items"]:
-                result.append(entry)
+            fetch_data: Dict = list_page(pageToken=page_token, fields=fields).execute()
+            result.extend(fetch_data["items"])
             page_token = fetch_data.get("nextPageToken")
             if not page_token:
                 break
@@ -157,14 +214,10 @@ class Calendar:
         Returns:
             Union[str, ValueError]: The calendar ID if found, otherwise raises a ValueError.
         """
-        schedule_name = name
-        calendar_list = self.get("calendars").data
-        if isinstance(calendar_list, List):
-            for item in calendar_list:
-                if item["summary"] == schedule_name:
-                    return item["id"]
-        else:
-            raise TypeError(f"This type '{type(calendar_list)}' can not be iterable.")
+        if self._name_to_id is None:
+            self._load_calendar_index()
+        if name in self._name_to_id:
+            return self._name_to_id[name]
         raise ValueError(
             f"Cannot find '{name}' id. You might need to create a calendar first."
         )
@@ -179,22 +232,51 @@ class Calendar:
         Returns:
             bool: True if the calendar exists, False otherwise.
         """
-        calendar_list = self.get("calendars").data
-        if isinstance(calendar_list, List):
-            calendar_list = [calendar["summary"] for calendar in calendar_list]
-        if name in calendar_list:
-            return True
-        return False
+        if self._name_to_id is None:
+            self._load_calendar_index()
+        return name in self._name_to_id
+
+    def _load_calendar_index(self) -> None:
+        """
+        Walk the user's calendar list once and index calendar ids by name.
 
-    def create_event(self, events: List[Dict[str, str]], name: str) -> None:
+        The index is shared by get_calendar_id and is_exist, and is kept up to date
+        by create_calendar, update_calendar and delete_calendar.
+        """
+        name_to_id: Dict[str, str] = {}
+        for item in self.get("calendars", fields="id,summary").data:
+            # keep the first match, as the previous linear lookup did
+            name_to_id.setdefault(item["summary"], item["id"])
+        self._name_to_id = name_to_id
+
+    def create_event(self, events: Iterable[Dict[str, str]], name: str) -> None:
         """
         Create events in a calendar.
 
         Args:
-            events (List[Dict[str, str]]): A list of event data dictionaries.
+            events (Iterable[Dict[str, str]]): The event data dictionaries, e.g. a list
+                or the generator returned by CalendarHelper.iter_format.
             name (str): The name of the calendar to create events in.
         """
-        for e in events:
+        calendar_id = self.get_calendar_id(name)
+        # request id -> event body, for the inserts of the current batch
+        pending: Dict[str, Dict] = {}
+        rate_limited: List[Dict] = []
+        # (event, exception) of the inserts that failed, raised once every batch is sent
+        failed: List[Tuple[Dict, Exception]] = []
+
+        def insert_callback(request_id: str, response: Dict, exception: Exception):
+            event = pending.pop(request_id)
+            if exception is None:
+                print("Inserted %s" % (response["summary"]))
+            elif _is_rate_limited(exception):
+                rate_limited.append(event)
+            else:
+                failed.append((event, exception))
+
+        batch = self.service.new_batch_http_request(callback=insert_callback)
+
+        for index, e in enumerate(events):
             event = {
                 "summary": f'{e["code"]} {e["name"]}',
                 "location": f'{e["room"]}',
@@ -220,12 +302,58 @@ class Calendar:
             if e["repeat"] and int(e["repeat"]) > 0:
                 event["recurrence"] = [f'RRULE:FREQ=WEEKLY;COUNT={e["repeat"]}']
 
-            result = (
-                self.service.events()
-                .insert(calendarId=self.get_calendar_id(name), body=event)
-                .execute()
+            request_id = str(index)
+            pending[request_id] = event
+            batch.add(
+                self.service.events().insert(calendarId=calendar_id, body=event),
+                request_id=request_id,
             )
-            print("Inserted %s" % (result["summary"]))
+
+            # Google caps a batch request at 50 calls
+            if len(pending) == BATCH_LIMIT:
+                batch.execute()
+                batch = self.service.new_batch_http_request(callback=insert_callback)
+
+        if pending:
+            batch.execute()
+
+        # Inserts rejected for going over the quota are independent of each other,
+        # so retry them concurrently; each one backs off on its own.
+        if rate_limited:
+            with ThreadPoolExecutor(max_workers=MAX_INSERT_WORKERS) as executor:
+                futures = [
+                    (event, executor.submit(self._insert_event, calendar_id, event))
+                    for event in rate_limited
+                ]
+                for event, future in futures:
+                    try:
+                        print("Inserted %s" % (future.result()["summary"]))
+                    except HttpError as exception:
+                        failed.append((event, exception))
+
+        if failed:
+            for event, exception in failed:
+                print(f"Failed to insert {event['summary']}: {exception}")
+            raise failed[0][1]
+
+    def _insert_event(self, calendar_id: str, event: Dict) -> Dict:
+        """
+        Insert a single event, retrying with exponential backoff when rate limited.
+
+        Args:
+            calendar_id (str): The ID of the calendar to insert the event in.
+            event (Dict): The event body.
+
+        Returns:
+            Dict: The created event.
+        """
+        # httplib2 connections are not thread-safe, so every call gets its own.
+        http = AuthorizedHttp(self.creds, http=httplib2.Http())
+        return (
+            self.service.events()
+            .insert(calendarId=calendar_id, body=event)
+            .execute(http=http, num_retries=INSERT_RETRIES)
+        )
 
     def create_calendar(self, name: str) -> None:
         """
@@ -240,6 +368,8 @@ class Calendar:
             "timeZone": TIME_ZONE,
         }
         created_calendar = self.service.calendars().insert(body=calendar).execute()
+        if self._name_to_id is not None:
+            self._name_to_id[name] = created_calendar["id"]
         print(f"Created calendar {created_calendar['summary']}.")
 
     def update_calendar(self, name: str, new_name: str):
@@ -250,18 +380,15 @@ class Calendar:
             name (str): The current name of the calendar.
             new_name (str): The new name for the calendar.
         """
-        # First retrieve the calendar from the API.
-        calendar: Dict = (
-            self.service.calendars()
-            .get(calendarId=self.get_calendar_id(name))
-            .execute()
-        )
-        calendar["summary"] = new_name
+        # Only the name changes, so patch it instead of fetching and updating the whole calendar.
         updated_calendar = (
             self.service.calendars()
-            .update(calendarId=calendar["id"], body=calendar)
+            .patch(calendarId=self.get_calendar_id(name), body={"summary": new_name})
             .execute()
         )
+        if self._name_to_id is not None:
+            self._name_to_id.pop(name, None)
+            self._name_to_id[new_name] = updated_calendar["id"]
         print(f"Changed calendar {updated_calendar['summary']}")
 
     def delete_calendar(self, name: str):
@@ -273,3 +400,5 @@ class Calendar:
         """
         calendar_id = self.get_calendar_id(name)
         self.service.calendars().delete(calendarId=calendar_id).execute()
+        if self._name_to_id is not None:
+            self._name_to_id.pop(name, None)
@@ -10,6 +10,8 @@ class Account(ABC):
     password: str
     name: str
     http(optional): HttpRequest
+    session_cache(optional): dict, data cached for the current login session.
+        It should be cleared on login and logout.
     """
 
     @abstractmethod
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from .account import Account
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple, Type
+
+# Upper bound on concurrent sessions, to stay within what the school servers tolerate
+MAX_WORKERS = 8
 
 
 class Schedule(ABC):
@@ -17,3 +21,50 @@ class Schedule(ABC):
 
     def get_semesters(self) -> Dict[str, List[str]]:
         ...
+
+
+def parse_dmy(value: str) -> Tuple[int, int, int]:
+    """
+    Parse a "dd/mm/yyyy" date, as the school portals write them, without strptime.
+
+    Args:
+        value (str): The date string.
+
+    Returns:
+        Tuple[int, int, int]: The year, month and day.
+    """
+    day, month, year = value.split("/")
+    return int(year), int(month), int(day)
+
+
+def extract_many(
+    schedule_class: Type[Schedule],
+    credentials: Sequence[Tuple[str, str]],
+    max_workers: int = MAX_WORKERS,
+    **kwargs,
+) -> List:
+    """
+    Get schedule data for many accounts concurrently.
+
+    Every account gets its own schedule instance, and so its own HTTP session;
+    get_data logs each of them in and out on its own.
+
+    Args:
+        schedule_class (Type[Schedule]): The school's schedule class, e.g. SGUSchedule.
+        credentials (Sequence[Tuple[str, str]]): (username, password) pairs.
+        max_workers (int, optional): The number of accounts processed at once. Defaults to MAX_WORKERS.
+        **kwargs: Arguments passed to get_data, e.g. semester.
+
+    Returns:
+        List: The schedule data of each account, in the order of `credentials`.
+    """
+
+    def extract(username: str, password: str):
+        return schedule_class(username, password).get_data(**kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(extract, username, password)
+            for username, password in credentials
+        ]
+        return [future.result() for future in futures]
@@ -1,7 +1,9 @@
+import json_utils
 import requests
 from fake_useragent import FakeUserAgent
-from urllib3.util import parse_url
-from typing import Any
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, parse_url
+from typing import Any, Dict
 
 
 class HttpRequest:
@@ -16,11 +18,26 @@ class HttpRequest:
     Methods:
         get(url: str, **kwargs) -> requests.Response: Perform an HTTP GET request.
         post(url: str, data: Any = None) -> requests.Response: Perform an HTTP POST request.
+        json(response: requests.Response) -> Any: Decode the JSON body of a response.
     """
 
-    session = requests.Session()
     ua = FakeUserAgent().random
-    headers = {"user-agent": ua, "host": ""}
+
+    def __init__(self) -> None:
+        # Each account gets its own session, so cookies and the Authorization header
+        # of one login never leak into another.
+        self.session = requests.Session()
+        # Keep connections to the school portal alive between login, scraping and logout,
+        # and retry idempotent requests that fail on a flaky connection.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.headers = {"user-agent": self.ua, "host": ""}
 
     def get(self, url: str, **kwargs) -> requests.Response:
         """
@@ -33,12 +50,8 @@ class HttpRequest:
         Returns:
             requests.Response: The response object containing the server's response to the request.
         """
-        if "headers" in kwargs.keys():
-            for k, v in kwargs["headers"].items():
-                self.headers[k] = v
-            kwargs.pop("headers")
-        self.headers["host"] = parse_url(url).hostname
-        return self.session.get(url=url, headers=self.headers, **kwargs)
+        headers = self._headers(url, kwargs.pop("headers", {}))
+        return self.session.get(url=url, headers=headers, **kwargs)
 
     def post(self, url: str, data: Any = None, **kwargs) -> requests.Response:
         """
@@ -51,9 +64,34 @@ class HttpRequest:
         Returns:
             requests.Response: The response object containing the server's response to the request.
         """
-        if "headers" in kwargs.keys():
-            for k, v in kwargs["headers"].items():
-                self.headers[k] = v
-            kwargs.pop("headers")
-        self.headers["host"] = parse_url(url).hostname
-        return self.session.post(url=url, headers=self.headers, data=data)
+        headers = self._headers(url, kwargs.pop("headers", {}))
+        return self.session.post(url=url, headers=headers, data=data)
+
+    def _headers(self, url: str, headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        Build the headers of a single request.
+
+        A new dict is returned rather than updating self.headers, so requests can run
+        concurrently and the headers of one request do not carry over to the next.
+
+        Args:
+            url (str): The URL the request is sent to.
+            headers (Dict[str, str]): The headers given for this request.
+
+        Returns:
+            Dict[str, str]: The default headers updated with the host and the given headers.
+        """
+        return {**self.headers, "host": parse_url(url).hostname, **headers}
+
+    @staticmethod
+    def json(response: requests.Response) -> Any:
+        """
+        Decode the JSON body of a response, using orjson when it is installed.
+
+        Args:
+            response (requests.Response): The response to decode.
+
+        Returns:
+            Any: The decoded body.
+        """
+        return json_utils.loads(response.content)
@@ -0,0 +1,38 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library is used without it
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON, using orjson when it is installed.
+
+    Args:
+        data (Union[bytes, str]): The JSON document.
+
+    Returns:
+        Any: The deserialized object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON, using orjson when it is installed.
+    Non-ASCII characters are written as is rather than escaped.
+
+    Args:
+        obj (Any): The object to serialize.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
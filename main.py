@@ -19,8 +19,9 @@ Functions:
     - `get_school()`: Prompt the user to select their school.
     - `get_semester(schedule)`: Prompt the user to select the semester and year.
     - `import_school_module(name)`: Import the school-specific module dynamically.
-    - `import_schedule(school)`: Import the schedule data from the selected school.
-    - `update_schedule(from_school)`: Update an existing calendar with new schedule data.
+    - `import_schedule(school, cal)`: Import the schedule data from the selected school.
+    - `update_schedule(from_school, cal)`: Update an existing calendar with new schedule data.
+    - `import_test_schedule(cal, school)`: Import the test schedule data from the selected school.
     - `main()`: Main function to interact with the user and execute import/update actions.
 
 Usage:
@@ -41,8 +42,6 @@ from api.calendar_helper import CalendarHelper
 from api.gg_calendar import Calendar
 from InquirerPy.resolver import prompt
 
-cal = Calendar()
-
 
 def get_user_credentials():
     print("Please provide your username and password for authentication")
@@ -63,10 +62,17 @@ def get_user_credentials():
 
 
 def get_school():
-    package = importlib.import_module("schools")
-    subpackage_name = []
-    for _, name, _ in pkgutil.walk_packages(package.__path__):
-        subpackage_name.append(name)
+    try:
+        from schools._registry import SCHOOLS
+
+        subpackage_name = list(SCHOOLS)
+    except ImportError:
+        # fall back to scanning the package when the registry is missing
+        package = importlib.import_module("schools")
+        subpackage_name = []
+        for _, name, is_pkg in pkgutil.walk_packages(package.__path__):
+            if is_pkg:
+                subpackage_name.append(name)
 
     questions = {
         "type": "list",
@@ -103,7 +109,7 @@ def import_school_module(name: str):
     return schedule_class
 
 
-def import_schedule(school):
+def import_schedule(school, cal: Calendar):
     calendar_name = input(f"(Optional) Calendar name (default: {config.DEFAULT_NAME}):")
 
     if not calendar_name:
@@ -121,7 +127,8 @@ def import_schedule(school):
             result = get_semester(schedule)
             if len(result) == 1:
                 semester = result["semesters"]
-                schedule_data = schedule.get_data(semester=semester)
+                # picked from get_semesters, so there is nothing to validate
+                schedule_data = schedule.get_data(semester=semester, validate=False)
             else:
                 semester = result["semesters"]
                 year = result["years"]
@@ -134,7 +141,7 @@ def import_schedule(school):
             schedule.user.logout()
 
 
-def update_schedule(from_school):
+def update_schedule(from_school, cal: Calendar):
     calendar_name = input(f"(Optional) Calendar name (default: {config.DEFAULT_NAME}):")
 
     if not calendar_name:
@@ -149,7 +156,8 @@ def update_schedule(from_school):
             result = get_semester(schedule)
             if len(result) == 1:
                 semester = result["semesters"]
-                schedule_data = schedule.get_data(semester=semester)
+                # picked from get_semesters, so there is nothing to validate
+                schedule_data = schedule.get_data(semester=semester, validate=False)
             else:
                 semester = result["semesters"]
                 year = result["years"]
@@ -166,7 +174,7 @@ def update_schedule(from_school):
         return
 
 
-def import_test_schedule(school="SGU"):
+def import_test_schedule(cal: Calendar, school="SGU"):
     calendar_name = input(f"(Optional) Calendar name (default: {config.DEFAULT_TEST_NAME}):")
 
     if not calendar_name:
@@ -214,14 +222,15 @@ def main():
         questions["choices"].append("Import test schedule")
 
     options = prompt(questions)
+    # Calendar() authenticates with Google, so it is only created for the options using it
     if options["mode"] == "Import":
-        import_schedule(school)
+        import_schedule(school, Calendar())
     elif options["mode"] == "Update":
-        update_schedule(school)
+        update_schedule(school, Calendar())
     elif options["mode"] == "Exit":
         exit()
     elif options["mode"] == "Import test schedule":
-        import_test_schedule()
+        import_test_schedule(Calendar())
     else:
         print("This option is not available.")
 
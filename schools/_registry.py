@@ -0,0 +1,3 @@
+# Subpackages of `schools` offered to the user by main.get_school.
+# Add the package name here when adding support for a new school.
+SCHOOLS = ("huflit", "sgu")
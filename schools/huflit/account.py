@@ -1,3 +1,5 @@
+from typing import Any, Dict
+
 from base.account import Account
 from exceptions import AuthenticationError
 from http_request import HttpRequest
@@ -14,6 +16,7 @@ class HuflitAccount(Account):
         logged_in (bool): A flag indicating whether the user is logged in.
         username (str): The username of the Huflit account.
         password (str): The password of the Huflit account.
+        session_cache (Dict[str, Any]): Data cached for the current login session.
 
     Methods:
         session_id() -> str: Get the ASP.NET_SessionId cookie value.
@@ -33,6 +36,7 @@ class HuflitAccount(Account):
         self.logged_in = False
         self.username = username
         self.password = password
+        self.session_cache: Dict[str, Any] = {}
 
     @property
     def session_id(self) -> str:
@@ -56,16 +60,16 @@ class HuflitAccount(Account):
 
         print("Logging in ...")
 
-        login_url = constants.BASE_URL + constants.LOGIN_ENDPOINT
         payload = {
             "txtTaiKhoan": self.username,
             "txtMatKhau": self.password,
         }
-        res = self.http.post(login_url, data=payload)
+        res = self.http.post(constants.LOGIN_URL, data=payload)
         # after the login is successful, the page will be redirected to the home page
         # we will accept this as a sign of successful authentication
         if res.history:
             self.logged_in = not self.logged_in
+            self.session_cache.clear()
         else:
             raise AuthenticationError("Login failed.")
 
@@ -81,16 +85,14 @@ class HuflitAccount(Account):
 
         print("Logging out ...")
 
-        logout_url = constants.BASE_URL + constants.LOGOUT_ENDPOINT
-        home_url = constants.BASE_URL + constants.HOME_ENDPOINT
-
-        res = self.http.get(logout_url)
+        res = self.http.get(constants.LOGOUT_URL)
         # check if the user is logged out or not
-        res = self.http.get(home_url)
+        res = self.http.get(constants.HOME_URL)
 
         # if there is history, it means the user was successfully logged out
         # because of the redirect happened.
         if res.history:
             self.logged_in = not self.logged_in
+            self.session_cache.clear()
         else:
             raise AuthenticationError("Logout failed. SessionID: " + self.session_id)
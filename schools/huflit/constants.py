@@ -5,6 +5,12 @@ LOGOUT_ENDPOINT = "/Login/Logout"
 SCHEDULE_API = "/Home/DrawingStudentSchedule_Perior"
 SCHEDULE_ENDPOINT = "/Home/Schedules"
 
+HOME_URL = BASE_URL + HOME_ENDPOINT
+LOGIN_URL = BASE_URL + LOGIN_ENDPOINT
+LOGOUT_URL = BASE_URL + LOGOUT_ENDPOINT
+SCHEDULE_API_URL = BASE_URL + SCHEDULE_API
+SCHEDULE_URL = BASE_URL + SCHEDULE_ENDPOINT
+
 WEEK_DAY = {
     "Hai": "2",
     "Ba": "3",
@@ -13,23 +19,25 @@ WEEK_DAY = {
     "Sáu": "6",
 }
 
-CLASS_TIME = {
-    "1": "06:45:00",
-    "2": "07:35:00",
-    "3": "08:25:00",
-    "4": "09:30:00",
-    "5": "10:25:00",
-    "6": "11:10:00",
-    "7": "12:45:00",
-    "8": "13:35:00",
-    "9": "14:25:00",
-    "10": "15:30:00",
-    "11": "16:25:00",
-    "12": "17:10:00",
-    "13": "18:15:00",
-    "14": "19:05:00",
-    "15": "19:55:00",
-}
+# start time (hour, minute, second) of each period, indexed by the period number
+CLASS_TIME = (
+    None,
+    (6, 45, 0),  # 1
+    (7, 35, 0),  # 2
+    (8, 25, 0),  # 3
+    (9, 30, 0),  # 4
+    (10, 25, 0),  # 5
+    (11, 10, 0),  # 6
+    (12, 45, 0),  # 7
+    (13, 35, 0),  # 8
+    (14, 25, 0),  # 9
+    (15, 30, 0),  # 10
+    (16, 25, 0),  # 11
+    (17, 10, 0),  # 12
+    (18, 15, 0),  # 13
+    (19, 5, 0),  # 14
+    (19, 55, 0),  # 15
+)
 
 # time for one lesson, in minute
 LESSON_TIME = 50
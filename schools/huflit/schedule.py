@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Dict, List, Union
+from io import BytesIO
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Union
 
-from bs4 import BeautifulSoup
+from lxml import etree, html
 
-from base.schedule import Schedule
+from base.schedule import Schedule, parse_dmy
 from exceptions import AuthenticationError
 from schools.huflit.account import HuflitAccount
 
@@ -12,6 +14,20 @@ from . import constants
 if TYPE_CHECKING:
     from http_request import HttpRequest
 
+# The portal serves UTF-8 pages; parsing the raw bytes skips decoding them twice.
+HTML_PARSER = html.HTMLParser(encoding="utf-8")
+YEAR_OPTIONS = etree.XPath('//select[@id="YearStudy"]/option/@value')
+SEMESTER_OPTIONS = etree.XPath('//select[@id="TermID"]/option/@value')
+
+# Start of each period as an offset from midnight, and the length of one period
+CLASS_TIME_OFFSET = tuple(
+    None
+    if period is None
+    else timedelta(hours=period[0], minutes=period[1], seconds=period[2])
+    for period in constants.CLASS_TIME
+)
+LESSON_DURATION = timedelta(minutes=constants.LESSON_TIME)
+
 
 class HUFLITSchedule(Schedule):
     """
@@ -23,7 +39,8 @@ class HUFLITSchedule(Schedule):
     Methods:
         user_session() -> HttpRequest: Get the user's HTTP session.
         standardization(subject_data: List) -> List[Dict]: Standardize the schedule data.
-        get_subject_date(subject: List) -> Dict: Get the start and end dates of a subject.
+        get_subject_date(subject: List) -> Tuple[str, str]: Get the start and end dates of a subject.
+        iter_rows(content: bytes) -> Iterator[List[str]]: Parse the schedule table row by row.
         get_semesters() -> Dict[str, List[str]]: Get available semesters and years.
         get_data(semester: str, year: str) -> Union[List[Dict], None]: Get schedule data for a specific semester and year.
     """
@@ -48,36 +65,47 @@ class HUFLITSchedule(Schedule):
         """
         return self.user.http
 
-    def standardization(self, subject_data) -> List[Dict[str, str]]:
+    def standardization(self, subject_data: Iterable[List[str]]) -> List[Dict[str, str]]:
         """
         Standardize the schedule data.
 
         Args:
-            subject_data (List): The raw schedule data.
+            subject_data (Iterable[List[str]]): The raw schedule data, e.g. the rows yielded by iter_rows.
 
         Returns:
             List[Dict]: The standardized schedule data.
         """
-        return_data = []
-        for subject in subject_data:
-            return_data.append(
-                {
-                    "code": subject[1],
-                    "name": subject[2],
-                    "credits": subject[3],
-                    "class": subject[4],
-                    "weekday": subject[5],
-                    "start_period": subject[6].split(" - ")[0],
-                    "end_period": subject[6].split(" - ")[1],
-                    "room": subject[7],
-                    "lecturer": subject[8],
-                    "from_date": self.get_subject_date(subject)["from_date"],
-                    "to_date": self.get_subject_date(subject)["to_date"],
-                }
-            )
-        return return_data
+        standardize_subject = self._standardize_subject
+        return [standardize_subject(subject) for subject in subject_data]
+
+    def _standardize_subject(self, subject: List[str]) -> Dict[str, str]:
+        """
+        Standardize a single row of the schedule table.
+
+        Args:
+            subject (List[str]): The text of each cell of the row.
 
-    def get_subject_date(self, subject):
+        Returns:
+            Dict[str, str]: The standardized subject data.
+        """
+        start_period, end_period = subject[6].split(" - ")
+        from_date, to_date = self.get_subject_date(subject)
+
+        return {
+            "code": subject[1],
+            "name": subject[2],
+            "credits": subject[3],
+            "class": subject[4],
+            "weekday": subject[5],
+            "start_period": start_period,
+            "end_period": end_period,
+            "room": subject[7],
+            "lecturer": subject[8],
+            "from_date": from_date,
+            "to_date": to_date,
+        }
+
+    def get_subject_date(self, subject) -> Tuple[str, str]:
         """
         Get the start and end dates of a subject.
 
@@ -85,45 +113,60 @@ class HUFLITSchedule(Schedule):
             subject (List): The subject data.
 
         Returns:
-            Dict: A dictionary containing "from_date" and "to_date" as ISO-formatted date strings.
+            Tuple[str, str]: The "from_date" and "to_date" as ISO-formatted date strings.
         """
-        start_period_time = constants.CLASS_TIME[subject[6].split(" - ")[0]]
-        period_count = int(subject[6].split(" - ")[1]) - int(subject[6].split(" - ")[0])
-        from_date = datetime.strptime(
-            f"{subject[9][1:11]} {start_period_time}", "%d/%m/%Y %H:%M:%S"
-        )
-        to_date = datetime.strptime(
-            f"{subject[9][13:-1]} {start_period_time}", "%d/%m/%Y %H:%M:%S"
+        start_period, end_period = map(int, subject[6].split(" - "))
+        class_time = CLASS_TIME_OFFSET[start_period]
+        period_count = end_period - start_period
+        from_date = datetime(*parse_dmy(subject[9][1:11])) + class_time
+        to_date = datetime(*parse_dmy(subject[9][13:-1])) + class_time
+        to_date += timedelta(days=7) + LESSON_DURATION * period_count
+
+        return (
+            from_date.isoformat(timespec="seconds"),
+            to_date.isoformat(timespec="seconds"),
         )
-        to_date += timedelta(days=7, minutes=constants.LESSON_TIME * period_count)
 
-        return {
-            "from_date": from_date.isoformat(),
-            "to_date": to_date.isoformat(),
-        }
+    @staticmethod
+    def iter_rows(content: bytes) -> Iterator[List[str]]:
+        """
+        Parse the schedule table row by row, freeing each row once it is processed.
+
+        Args:
+            content (bytes): The HTML of the schedule table.
+
+        Yields:
+            List[str]: The text of each cell of a row.
+        """
+        for _, row in etree.iterparse(
+            BytesIO(content), tag="tr", html=True, encoding="utf-8"
+        ):
+            yield ["".join(col.itertext()) for col in row.iterchildren("td")]
+            # free the row and the already processed siblings before it
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
 
     def get_semesters(self) -> Dict[str, List[str]]:
         """
         Get available semesters and years.
+        The result is cached until the user logs in or out again.
 
         Returns:
             Dict[str, List[str]]: A dictionary containing lists of available semesters and years.
         """
         if self.user.logged_in:
-            schedule_url = constants.BASE_URL + constants.SCHEDULE_ENDPOINT
-            soup = BeautifulSoup(
-                self.user_session.get(schedule_url).text,
-                "lxml",
+            if "semesters" in self.user.session_cache:
+                return self.user.session_cache["semesters"]
+
+            doc = html.fromstring(
+                self.user_session.get(constants.SCHEDULE_URL).content, parser=HTML_PARSER
             )
-            result_years = soup.find("select", {"id": "YearStudy"})
-            result_semesters = soup.find("select", {"id": "TermID"})
-
-            semesters = result_semesters.find_all("option")  # type: ignore
-            years = result_years.find_all("option")  # type: ignore
-            return {
-                "semesters": [semester.attrs["value"] for semester in semesters],
-                "years": [year.attrs["value"] for year in years],
+            self.user.session_cache["semesters"] = {
+                "semesters": [str(semester) for semester in SEMESTER_OPTIONS(doc)],
+                "years": [str(year) for year in YEAR_OPTIONS(doc)],
             }
+            return self.user.session_cache["semesters"]
         else:
             raise AuthenticationError("User is not logged in.")
 
@@ -139,8 +182,6 @@ class HUFLITSchedule(Schedule):
             Union[List[Dict[str, str]], None]: The schedule data as a list of dictionaries or None if no data is available.
         """
         if self.user.logged_in:
-            data = []
-            schedule_url = constants.BASE_URL + constants.SCHEDULE_API
 
             available_semesters = self.get_semesters()
             if (
@@ -152,24 +193,19 @@ class HUFLITSchedule(Schedule):
                 )
 
             payload = {"YearStudy": year, "TermID": semester}
-            response_data = self.user_session.get(schedule_url, params=payload)
-
-            soup = BeautifulSoup(response_data.text, "lxml")
-            rows = soup.find_all("tr")
-            for row in rows:
-                tmp = []
-                for col in row.find_all("td"):
-                    tmp.append(col.text)
-                data.append(tmp)
+            response_data = self.user_session.get(constants.SCHEDULE_API_URL, params=payload)
 
-            data = data[2:]
+            # the first two rows are the table headers
+            rows = islice(self.iter_rows(response_data.content), 2, None)
+            # peek at the first rows, the rest is standardized as it is parsed
+            first_rows = list(islice(rows, 2))
 
-            if len(data) == 1:
+            if len(first_rows) == 1:
                 # 'chua co thoi khoa bieu'
-                print(data[0][0])
+                print(first_rows[0][0])
                 return None
             else:
-                return self.standardization(data)
+                return self.standardization(chain(first_rows, rows))
         else:
             try:
                 self.user.login()
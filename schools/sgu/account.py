@@ -1,4 +1,5 @@
-from bs4 import BeautifulSoup
+from typing import Any, Dict
+
 from base.account import Account
 from exceptions import AuthenticationError
 from http_request import HttpRequest
@@ -16,6 +17,7 @@ class SGUAccount(Account):
         username (str): The username of the SGU account.
         password (str): The password of the SGU account.
         name (str): The name of the authenticated user.
+        session_cache (Dict[str, Any]): Data cached for the current login session.
 
     Methods:
         session_id() -> str: Get the ASP.NET_SessionId cookie value.
@@ -39,6 +41,7 @@ class SGUAccount(Account):
 
         self.token_type = ""
         self.access_token = ""
+        self.session_cache: Dict[str, Any] = {}
 
     @property
     def session_id(self) -> str:
@@ -69,15 +72,16 @@ class SGUAccount(Account):
         }
 
         res = self.http.post(
-            url=constants.BASE_URL + constants.LOGIN_ENDPOINT,
+            url=constants.LOGIN_URL,
             data=payload,
         )
 
-        res = res.json()
+        res = self.http.json(res)
 
-        if int(res["code"]) == 200:
+        if str(res["code"]) == "200":
             self.logged_in = not self.logged_in
             self.name = res["name"]
+            self.session_cache.clear()
 
             self.token_type = res["token_type"]
             self.access_token = res["access_token"]
@@ -99,12 +103,13 @@ class SGUAccount(Account):
         print("Logging out ...")
 
         res = self.http.post(
-            constants.BASE_URL + constants.LOGOUT_ENDPOINT,
+            constants.LOGOUT_URL,
         )
 
-        res = res.json()
+        res = self.http.json(res)
 
-        if int(res["code"]) == 200:
+        if str(res["code"]) == "200":
             self.logged_in = not self.logged_in
+            self.session_cache.clear()
         else:
             raise AuthenticationError("Logout failed. SessionID: " + self.session_id)
@@ -1,3 +1,5 @@
+from datetime import date
+
 BASE_URL = "https://thongtindaotao.sgu.edu.vn"
 DEFAULT_ENDPOINT = "/#/home"
 SCHEDULE_ENDPOINT = "/api/sch/w-locdstkbhockytheodoituong"
@@ -7,41 +9,53 @@ SCHEDULE_LIST_ENDPOINT = "/api/sch/w-locdshockytkbuser"
 SCHEDULE_DETAIL_ENDPOINT = "/api/sch/w-locdstkbhockytheodoituong"
 TEST_SCHEDULE_ENDPOINT = "/api/epm/w-locdslichthisvtheohocky"
 
+LOGIN_URL = BASE_URL + LOGIN_ENDPOINT
+LOGOUT_URL = BASE_URL + LOGOUT_ENDPOINT
+SCHEDULE_URL = BASE_URL + SCHEDULE_ENDPOINT
+SCHEDULE_LIST_URL = BASE_URL + SCHEDULE_LIST_ENDPOINT
+TEST_SCHEDULE_URL = BASE_URL + TEST_SCHEDULE_ENDPOINT
+
+# start time (hour, minute, second) of each period, keyed by the period number
 CLASS_TIME = {
-    "1": "07:00:00",
-    "2": "07:50:00",
-    "3": "09:00:00",
-    "4": "09:50:00",
-    "5": "10:40:00",
-    "6": "13:00:00",
-    "7": "13:50:00",
-    "8": "15:00:00",
-    "9": "15:50:00",
-    "10": "16:40:00",
-    "11": "17:40:00",
-    "12": "18:30:00",
-    "13": "19:20:00",
+    1: (7, 0, 0),
+    2: (7, 50, 0),
+    3: (9, 0, 0),
+    4: (9, 50, 0),
+    5: (10, 40, 0),
+    6: (13, 0, 0),
+    7: (13, 50, 0),
+    8: (15, 0, 0),
+    9: (15, 50, 0),
+    10: (16, 40, 0),
+    11: (17, 40, 0),
+    12: (18, 30, 0),
+    13: (19, 20, 0),
 }
 
+# days from Monday, keyed by the Vietnamese weekday number
 WEEK_DAY = {
-    "2": 0,
-    "3": 1,
-    "4": 2,
-    "5": 3,
-    "6": 4,
-    "7": 5
+    2: 0,
+    3: 1,
+    4: 2,
+    5: 3,
+    6: 4,
+    7: 5
 }
 
+# first day of each semester
 SEMESTER_DATE = {
-    "20211": "13/09/2021",
-    "20212": "14/02/2022",
-    "20221": "05/09/2022",
-    "20222": "06/02/2023",
-    "20223": "26/06/2023",
-    "20231": "04/09/2023",
-    "20232": "15/01/2024",
-    "20241": "02/09/2024"
+    "20211": date(2021, 9, 13),
+    "20212": date(2022, 2, 14),
+    "20221": date(2022, 9, 5),
+    "20222": date(2023, 2, 6),
+    "20223": date(2023, 6, 26),
+    "20231": date(2023, 9, 4),
+    "20232": date(2024, 1, 15),
+    "20241": date(2024, 9, 2),
 }
 
 # time for one lesson, in minute
 LESSON_TIME = 50
+
+# how long get_data reuses a semester's schedule within a login session, in seconds
+DATA_CACHE_TTL = 300
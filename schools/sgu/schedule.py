@@ -1,15 +1,38 @@
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Dict, List, Union
-from base.schedule import Schedule
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Tuple, Union
+from base.schedule import MAX_WORKERS, Schedule, parse_dmy
 from exceptions import AuthenticationError
 from schools.sgu.account import SGUAccount
 import json
+import re
+from time import monotonic
 
 from . import constants
 
 if TYPE_CHECKING:
     from http_request import HttpRequest
 
+LEADING_NON_DIGITS = re.compile(r"\D*")
+
+# Midnight of each semester's first day, and each period's start as an offset from it
+SEMESTER_START = {
+    semester: datetime.combine(start_date, time())
+    for semester, start_date in constants.SEMESTER_DATE.items()
+}
+CLASS_TIME_OFFSET = {
+    period: timedelta(hours=hour, minutes=minute, seconds=second)
+    for period, (hour, minute, second) in constants.CLASS_TIME.items()
+}
+# Days from the Monday of a week to each weekday number ('thu')
+WEEK_DAY = constants.WEEK_DAY
+LESSON_DURATION = timedelta(minutes=constants.LESSON_TIME)
+# Length of a class by its number of periods, for the usual class lengths
+PERIOD_DURATION = {
+    period_count: LESSON_DURATION * period_count
+    for period_count in range(len(constants.CLASS_TIME) + 1)
+}
+
 
 class SGUSchedule(Schedule):
     """
@@ -24,8 +47,10 @@ class SGUSchedule(Schedule):
     Methods:
         get_semester() -> Dict[str, List[str]]: Get available semesters.
         standardization(subject_data) -> List[Dict[str, str]]: Standardize subject data.
-        get_subject_date(subject) -> Dict[str, str]: Get subject date range.
-        get_data(semester: str = "") -> Union[List[Dict[str, str]], None]: Get schedule data for a specific semester.
+        get_subject_date(thu, tbd, so_tiet, tkb) -> Tuple[str, str]: Get subject date range.
+        get_data(semester: str = "", validate: bool = True) -> Union[List[Dict[str, str]], None]: Get schedule data for a specific semester.
+        fetch_data(semester: str) -> List[Dict]: Fetch the raw schedule data of a semester.
+        get_many(semesters: List[Union[str, int]]) -> List[List[Dict[str, str]]]: Get schedule data for several semesters.
 
     Returns:
         data (List[List[str, str]]): A list of standardized schedule data.
@@ -62,47 +87,33 @@ class SGUSchedule(Schedule):
     def user_session(self) -> "HttpRequest":
         return self.user.http
 
-    def standardization(self, subject_data, is_test=False) -> List[Dict[str, str]]:
+    def standardization(
+        self, subject_data: List[Dict[str, Any]], is_test: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Standardize the subject data extracted from the website.
 
         Args:
-            subject_data: The raw subject data.
+            subject_data (List[Dict[str, Any]]): The raw subject data.
+            is_test (bool, optional): Whether the data is an exam schedule. Defaults to False.
 
         Returns:
-            List[Dict[str, str]]: The standardized subject data.
+            List[Dict[str, Any]]: The standardized subject data.
         """
-        return_data = []
+        return_data: List[Dict[str, Any]] = []
         if not is_test:
-            for subject in subject_data:
-                if not subject["thu"]:
-                    continue
-                return_data.append(
-                    {
-                        "code": subject["ma_mon"],
-                        "name": subject["ten_mon"],
-                        "credits": subject["so_tc"],
-                        "class": subject["lop"],
-                        "weekday": subject["thu"],
-                        "start_period": subject["tbd"],
-                        "end_period": str(
-                            int(subject["tbd"]) + int(subject["so_tiet"])
-                        ),
-                        "room": subject["phong"],
-                        "lecturer": subject["gv"],
-                        "from_date": self.get_subject_date(subject)["from_date"],
-                        "to_date": self.get_subject_date(subject)["to_date"],
-                    }
-                )
+            standardize_subject = self._standardize_subject
+            return_data = [
+                standardize_subject(subject) for subject in subject_data if subject["thu"]
+            ]
         else:
             for subject in subject_data:
                 ngay_thi = subject["ngay_thi"]
                 gio_thi = subject["gio_bat_dau"]
                 so_phut = subject["so_phut"]
 
-                from_date = datetime.strptime(
-                    f"{ngay_thi} {gio_thi}:00", "%d/%m/%Y %H:%M:%S"
-                )
+                hour, minute = gio_thi.split(":")
+                from_date = datetime(*parse_dmy(ngay_thi), int(hour), int(minute))
                 to_date = from_date + timedelta(minutes=int(so_phut))
 
                 return_data.append(
@@ -111,80 +122,158 @@ class SGUSchedule(Schedule):
                         "name": subject["ten_mon"],
                         "day": subject["ngay_thi"],
                         "room": subject["ma_phong"],
-                        "from_date": from_date.isoformat(),
-                        "to_date": to_date.isoformat(),
+                        "from_date": from_date.isoformat(timespec="seconds"),
+                        "to_date": to_date.isoformat(timespec="seconds"),
                     }
                 )
 
         return return_data
 
-    def get_subject_date(self, subject) -> Dict[str, str]:
+    def _standardize_subject(self, subject: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get the date range for a subject.
+        Standardize a single class of the schedule.
 
         Args:
-            subject: The subject data.
+            subject (Dict[str, Any]): The raw subject data, with a 'thu'.
 
         Returns:
-            Dict[str, str]: A dictionary containing 'from_date' and 'to_date'.
+            Dict[str, Any]: The standardized subject data.
         """
-        semester_start_date = constants.SEMESTER_DATE[self.semester]
-        weekday = constants.WEEK_DAY[str(subject["thu"])]
-        start_period_time = constants.CLASS_TIME[str(subject["tbd"])]
-        period_count = int(subject["so_tiet"])
-
-        from_date = datetime.strptime(
-            f"{semester_start_date} {start_period_time}", "%d/%m/%Y %H:%M:%S"
-        )
-
-        for c in subject["tkb"]:
-            if c.isdigit():
-                break
-            else:
-                from_date += timedelta(days=7)
-        from_date += timedelta(days=weekday)
-
-        to_date = from_date
-        to_date += timedelta(
-            days=7 * len(subject["tkb"].replace("-", "")),
-            minutes=constants.LESSON_TIME * period_count,
+        tbd = int(subject["tbd"])
+        so_tiet = int(subject["so_tiet"])
+        from_date, to_date = self.get_subject_date(
+            int(subject["thu"]), tbd, so_tiet, subject["tkb"]
         )
 
         return {
-            "from_date": from_date.isoformat(),
-            "to_date": to_date.isoformat(),
+            "code": subject["ma_mon"],
+            "name": subject["ten_mon"],
+            "credits": subject["so_tc"],
+            "class": subject["lop"],
+            "weekday": subject["thu"],
+            "start_period": subject["tbd"],
+            "end_period": str(tbd + so_tiet),
+            "room": subject["phong"],
+            "lecturer": subject["gv"],
+            "from_date": from_date,
+            "to_date": to_date,
         }
 
+    def get_subject_date(
+        self, thu: int, tbd: int, so_tiet: int, tkb: str
+    ) -> Tuple[str, str]:
+        """
+        Get the date range for a subject.
+
+        Args:
+            thu (int): The weekday number of the class ('thu').
+            tbd (int): The period the class starts at ('tbd').
+            so_tiet (int): The number of periods of the class ('so_tiet').
+            tkb (str): The weeks the class takes place in ('tkb').
+
+        Returns:
+            Tuple[str, str]: The 'from_date' and 'to_date' as ISO-formatted date strings.
+        """
+        # every character of 'tkb' is a week; the class starts at the first digit
+        leading_weeks = LEADING_NON_DIGITS.match(tkb).end()
+        # weeks with a class: every character but the '-' placeholders
+        class_weeks = len(tkb) - tkb.count("-")
+
+        from_date = (
+            SEMESTER_START[self.semester]
+            + CLASS_TIME_OFFSET[tbd]
+            + timedelta(days=7 * leading_weeks + WEEK_DAY[thu])
+        )
+        duration = PERIOD_DURATION.get(so_tiet)
+        if duration is None:
+            # periods outside the table are computed as before it existed
+            duration = LESSON_DURATION * so_tiet
+        to_date = from_date + timedelta(days=7 * class_weeks) + duration
+
+        return (
+            from_date.isoformat(timespec="seconds"),
+            to_date.isoformat(timespec="seconds"),
+        )
+
     def get_semesters(self) -> Dict[str, List[str]]:
         """
         Get available semesters.
+        The result is cached until the user logs in or out again.
 
         Returns:
             Dict[str, List[str]]: A dictionary containing 'semesters'.
         """
+        return self._load_semesters()[0]
+
+    def _load_semesters(self) -> Tuple[Dict[str, List[str]], FrozenSet[str]]:
+        """
+        Get available semesters, along with a set of them for validating semesters.
+        Both are cached together until the user logs in or out again.
+
+        Returns:
+            Tuple[Dict[str, List[str]], FrozenSet[str]]: The result of get_semesters and the set of its semesters as strings.
+        """
         semesters = []
         if self.user.logged_in:
+            if "semesters" in self.user.session_cache:
+                return self.user.session_cache["semesters"]
+
             res = self.user_session.post(
-                constants.BASE_URL + constants.SCHEDULE_LIST_ENDPOINT
+                constants.SCHEDULE_LIST_URL
             )
 
             if res.status_code == 200:
-                res = res.json()
+                res = self.user_session.json(res)
                 semesters = res["data"]["ds_hoc_ky"]
-
-            return {"semesters": [semester["hoc_ky"] for semester in semesters]}
+            else:
+                # do not cache a failed request
+                return {"semesters": []}, frozenset()
+
+            semesters = [semester["hoc_ky"] for semester in semesters]
+            # The API sends the semesters as numbers; they are looked up as strings,
+            # the way self.semester stores them.
+            self.user.session_cache["semesters"] = (
+                {"semesters": semesters},
+                frozenset(str(semester) for semester in semesters),
+            )
+            return self.user.session_cache["semesters"]
         else:
             raise AuthenticationError("User is not logged in.")
 
-    def get_data(self, semester: str = "") -> Union[List[Dict[str, str]], None]:
+    @staticmethod
+    def _check_semester(
+        semester: str, semesters: Tuple[Dict[str, List[str]], FrozenSet[str]]
+    ) -> None:
+        """
+        Check a semester against the available semesters.
+
+        Args:
+            semester (str): The semester to check, converted to a string.
+            semesters (Tuple[Dict[str, List[str]], FrozenSet[str]]): The result of _load_semesters.
+
+        Raises:
+            ValueError: If the semester is not one of them.
+        """
+        available_semesters, semester_set = semesters
+        if semester not in semester_set:
+            raise ValueError(
+                f"The semester is invalid. It must be one of {available_semesters['semesters']}"
+            )
+
+    def get_data(
+        self, semester: str = "", validate: bool = True
+    ) -> Union[List[Dict[str, str]], None]:
         """
         Get schedule data for a specific semester.
 
         Args:
             semester (str, optional): The semester for which to get the schedule data. Defaults to an empty string.
+            validate (bool, optional): Check the semester against get_semesters. Pass False when the
+                semester was already taken from get_semesters, to skip the check. Defaults to True.
 
         Returns:
             Union[List[Dict[str, str]], None]: A list of standardized schedule data, or None if no data is available.
+            The data is reused for constants.DATA_CACHE_TTL seconds within the same login session.
 
         Raises:
             AuthenticationError: If the user is not logged in.
@@ -192,45 +281,111 @@ class SGUSchedule(Schedule):
         """
 
         if self.user.logged_in:
+            cached = self.user.session_cache.setdefault("data", {})
+            if semester and str(semester) in cached:
+                cached_at, rows = cached[str(semester)]
+                if monotonic() - cached_at < constants.DATA_CACHE_TTL:
+                    self.semester = str(semester)
+                    # callers format the rows in place, so hand out copies
+                    return [dict(row) for row in rows]
+
+            data = None
             if not semester:
                 semester = self.get_semesters()["semesters"][0]
                 print(
                     "Semester not found. Class schedule will be taken from this semester:",
                     semester,
                 )
-            else:
-                available_semesters = self.get_semesters()["semesters"]
-                if semester not in available_semesters:
-                    raise ValueError(
-                        f"The semester is invalid. It must be one of {available_semesters}"
-                    )
+            elif validate:
+                if "semesters" in self.user.session_cache:
+                    # already fetched this session, no request is made
+                    semesters = self._load_semesters()
+                else:
+                    # The semester list is only needed for validation, so fetch the
+                    # schedule at the same time instead of waiting for it.
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        semesters_future = executor.submit(self._load_semesters)
+                        schedule = executor.submit(self.fetch_data, str(semester))
+                        semesters = semesters_future.result()
+                        data = schedule.result()
+                self._check_semester(str(semester), semesters)
             self.semester = str(semester)
-
-            data = []
-            payload = {"hoc_ky": self.semester, "id_du_lieu": None, "loai_doi_tuong": 1}
-
-            response = self.user_session.post(
-                constants.BASE_URL + constants.SCHEDULE_ENDPOINT,
-                data=payload,
-            )
-
-            if response.status_code == 200:
-                res = response.json()
-
-                # check if that semester has a schedule or not
-                if res["data"]["total_items"] != 0:
-                    data = res["data"]["ds_nhom_to"]
-
-            return self.standardization(data)
+            if data is None:
+                data = self.fetch_data(self.semester)
+            rows = self.standardization(data)
+            cached[self.semester] = (monotonic(), rows)
+            return [dict(row) for row in rows]
         else:
             try:
                 print("User is not logged in. Trying to login...")
                 self.user.login()
-                data = self.get_data(semester)
+                data = self.get_data(semester, validate)
                 return data
             finally:
                 self.user.logout()
 
+    def fetch_data(self, semester: str) -> List[Dict]:
+        """
+        Fetch the raw schedule data of a semester, without validating or standardizing it.
+
+        Args:
+            semester (str): The semester for which to get the schedule data.
+
+        Returns:
+            List[Dict]: The raw subject data, empty if the semester has no schedule.
+        """
+        data = []
+        payload = {"hoc_ky": semester, "id_du_lieu": None, "loai_doi_tuong": 1}
+
+        response = self.user_session.post(
+            constants.SCHEDULE_URL,
+            data=payload,
+        )
+
+        if response.status_code == 200:
+            res = self.user_session.json(response)
+
+            # check if that semester has a schedule or not
+            if res["data"]["total_items"] != 0:
+                data = res["data"]["ds_nhom_to"]
+
+        return data
+
+    def get_many(self, semesters: List[Union[str, int]]) -> List[List[Dict[str, str]]]:
+        """
+        Get schedule data for several semesters, fetching them concurrently.
+
+        Args:
+            semesters (List[Union[str, int]]): The semesters for which to get the schedule data,
+                either as returned by get_semesters or as strings.
+
+        Returns:
+            List[List[Dict[str, str]]]: The standardized schedule data of each semester, in the given order.
+
+        Raises:
+            AuthenticationError: If the user is not logged in.
+            ValueError: If one of the semesters is invalid.
+        """
+        if not self.user.logged_in:
+            raise AuthenticationError("User is not logged in.")
+
+        # validated and stored as strings, like self.semester
+        semesters = [str(semester) for semester in semesters]
+        available_semesters = self._load_semesters()
+        for semester in semesters:
+            self._check_semester(semester, available_semesters)
+
+        # The requests are independent; only standardization depends on self.semester,
+        # so it runs afterwards, one semester at a time.
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            raw_data = list(executor.map(self.fetch_data, semesters))
+
+        result = []
+        for semester, data in zip(semesters, raw_data):
+            self.semester = semester
+            result.append(self.standardization(data))
+        return result
+
     def get_test_data(self, semester):
         if self.user.logged_in:
             if not semester:
@@ -240,11 +395,7 @@ class SGUSchedule(Schedule):
                     semester,
                 )
             else:
-                available_semesters = self.get_semesters()["semesters"]
-                if semester not in available_semesters:
-                    raise ValueError(
-                        f"The semester is invalid. It must be one of {available_semesters}"
-                    )
+                self._check_semester(str(semester), self._load_semesters())
             self.semester = str(semester)
 
             data = []
@@ -273,14 +424,14 @@ class SGUSchedule(Schedule):
             }
 
             response = self.user_session.post(
-                constants.BASE_URL + constants.TEST_SCHEDULE_ENDPOINT,
+                constants.TEST_SCHEDULE_URL,
                 data=json.dumps(payload),
                 headers=headers
             )
 
             # this status code check just to know the request was succeed.
             if response.status_code == 200:
-                res = response.json()
+                res = self.user_session.json(response)
                 # this is the real status code check🤡
                 if res["code"] == 200:
                     # check if that semester has a schedule or not